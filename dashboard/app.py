@@ -2,13 +2,31 @@
 # San Francisco Crime Analytics (2018–2025) + 2026 Outlook
 # Streamlit dashboard reading precomputed parquet artifacts from data/processed/
 
+import io
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import streamlit as st
 
+from validation import (
+    FC_DTYPES,
+    MC_DTYPES,
+    MNC_DTYPES,
+    is_validated,
+    validate_forecast,
+    validate_monthly_citywide,
+    validate_monthly_nbh_cat,
+)
+
 
 # ============================================================
 # Paths (robust no matter where you run from)
@@ -18,6 +36,11 @@ ROOT_DIR = APP_DIR.parent                      # project root
 DATA_DIR = ROOT_DIR / "data" / "processed"
 
 MONTHLY_NBH_CAT_FILE = DATA_DIR / "monthly_neighborhood_category.parquet"
+YEARLY_NBH_CAT_FILE = DATA_DIR / "yearly_neighborhood_category.parquet"
+TOP_NBH_BY_YEAR_FILE = DATA_DIR / "top_neighborhoods_by_year.parquet"
+TOP_CAT_BY_YEAR_FILE = DATA_DIR / "top_categories_by_year.parquet"
+MONTHLY_CAT_FILE = DATA_DIR / "monthly_category.parquet"
+CATEGORY_ORDER_FILE = DATA_DIR / "category_order.parquet"
 HOURLY_WEEKDAY_FILE = DATA_DIR / "hourly_weekday_counts.parquet"
 MONTHLY_CITYWIDE_FILE = DATA_DIR / "monthly_citywide.parquet"
 FORECAST_FILE = DATA_DIR / "forecast_citywide_monthly_2026.parquet"
@@ -37,10 +60,183 @@ st.caption("Portfolio dashboard built from precomputed SFPD aggregates (parquet)
 # ============================================================
 # Load artifacts
 # ============================================================
-@st.cache_data(show_spinner="Loading dashboard artifacts...")
+MNC_COLUMNS = ["year_month", "year", "neighborhood", "incident_category", "incidents"]
+YNC_COLUMNS = ["year", "neighborhood", "incident_category", "incidents"]
+TOP_NBH_COLUMNS = ["year", "neighborhood", "incidents"]
+TOP_CAT_COLUMNS = ["year", "incident_category", "incidents"]
+MCAT_COLUMNS = ["year_month", "year", "incident_category", "incidents"]
+CATEGORY_ORDER_COLUMNS = ["incident_category"]
+HW_COLUMNS = ["weekday_label", "hour", "incident_category", "incidents"]
+MC_COLUMNS = ["month", "incidents"]
+FC_COLUMNS = ["month", "forecast", "lower", "upper"]
+
+# Low-cardinality string columns, kept dictionary-encoded / categorical throughout
+LABEL_COLUMNS = ["neighborhood", "incident_category"]
+
+# Keep string columns in their Arrow buffers instead of boxing them into Python objects
+ARROW_STRING_TYPES = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.large_string(): pd.StringDtype("pyarrow"),
+}
+
+
+def to_frame(table):
+    """Single Arrow -> pandas conversion path shared by every artifact reader.
+
+    split_blocks keeps one pandas block per column (no consolidation copy) and
+    self_destruct releases each Arrow column as soon as it has been converted,
+    so the table must not be used afterwards.
+    """
+    return table.to_pandas(types_mapper=ARROW_STRING_TYPES.get, split_blocks=True, self_destruct=True)
+
+
+def read_parquet_table(path, columns, filters=None):
+    # Memory-mapped file with coalesced, pre-buffered column-chunk reads. Label
+    # columns stay dictionary-encoded, so they arrive in pandas as categoricals.
+    return pq.read_table(
+        path,
+        columns=columns,
+        filters=filters,
+        read_dictionary=[col for col in LABEL_COLUMNS if col in columns],
+        memory_map=True,
+        pre_buffer=True,
+    )
+
+
+def require_columns(path, columns, available=None):
+    """Check an artifact's schema (parquet footer by default) for the columns the dashboard needs."""
+    if available is None:
+        available = pq.read_schema(path).names
+    missing = sorted(set(columns) - set(available))
+    if missing:
+        raise ValueError(f"{path.stem} missing columns: {missing}")
+
+
+def require_clean_hourly(path):
+    """Fail at startup unless the hourly artifact is in the builder's validated form.
+
+    It is only queried per selection, so it never passes through validation in
+    the app: labels and counts must be non-null, hour an integer in 0-23.
+    """
+    require_columns(path, HW_COLUMNS)
+    table = read_parquet_table(path, HW_COLUMNS)
+
+    invalid = [col for col in HW_COLUMNS if table.column(col).null_count]
+    invalid += [col for col in ["hour", "incidents"] if not pa.types.is_integer(table.schema.field(col).type)]
+    if "hour" not in invalid and table.num_rows:
+        hours = pc.min_max(table.column("hour"))
+        if hours["min"].as_py() < 0 or hours["max"].as_py() > 23:
+            invalid.append("hour")
+    if invalid:
+        raise ValueError(
+            f"{path.stem} has missing or invalid values in {sorted(set(invalid))}; "
+            "rebuild it with python -m src.build_dashboard_artifacts"
+        )
+
+
+def load_parquet(path, columns, filters=None):
+    """Read only the needed columns (and rows matching `filters`) of a parquet artifact."""
+    require_columns(path, columns)
+
+    return to_frame(read_parquet_table(path, columns, filters))
+
+
+def load_artifact(path, columns):
+    """Load a startup artifact, preferring its memory-mapped Arrow IPC copy when current."""
+    arrow_path = path.with_suffix(".arrow")
+    # A parquet file rewritten after its copy was made (e.g. by rerunning the
+    # forecasting notebook without the builder) wins over the stale copy
+    if not arrow_path.exists() or path.stat().st_mtime > arrow_path.stat().st_mtime:
+        return load_parquet(path, columns)
+
+    # Check the IPC footer schema, then map only the projected columns from the same reader
+    with pa.memory_map(str(arrow_path)) as source:
+        reader = pa.ipc.open_file(source)
+        require_columns(path, columns, available=reader.schema.names)
+        table = reader.read_all().select(columns)
+    return to_frame(table)
+
+
+def totals_frame(key, dictionary, totals, counts):
+    """Label/incidents frame from per-code totals, keeping only codes with rows."""
+    present = np.flatnonzero(counts)
+    return to_frame(pa.table({
+        key: pa.DictionaryArray.from_arrays(pa.array(present, pa.int32()), dictionary),
+        "incidents": totals[present].astype(np.int64),
+    }))
+
+
+def sum_by_codes(table, key):
+    """Per-value incident totals of one dictionary-encoded column.
+
+    A single bincount over the dictionary codes replaces the hash group-by;
+    values with no rows in `table` are dropped, as a group-by would.
+    """
+    column = table.unify_dictionaries().column(key).combine_chunks()
+    codes = column.indices.to_numpy()
+    n = len(column.dictionary)
+
+    totals = np.bincount(codes, weights=table.column("incidents").to_numpy(), minlength=n)
+    return totals_frame(key, column.dictionary, totals, np.bincount(codes, minlength=n))
+
+
+def aggregate_incidents(path, keys, filters):
+    """SELECT keys, SUM(incidents) FROM path WHERE filters GROUP BY keys.
+
+    Projection, predicate pushdown and the group-by all run inside Arrow's
+    vectorized engine; only the aggregated rows are converted to pandas.
+    """
+    keys = list(keys)
+    require_columns(path, [*keys, "incidents"])
+
+    table = read_parquet_table(path, [*keys, "incidents"], filters or None)
+    if len(keys) == 1 and keys[0] in LABEL_COLUMNS and table.num_rows:
+        return sum_by_codes(table, keys[0])
+
+    out = to_frame(table.group_by(keys).aggregate([("incidents", "sum")]))
+    # Arrow sums uint32 into uint64; int64 matches the bincount paths (totals_frame)
+    out = out.rename(columns={"incidents_sum": "incidents"}).astype({"incidents": np.int64})
+    return out[[*keys, "incidents"]]
+
+
+# Cached per query for the hour/weekday views; the Tab 1 queries are cached
+# together in compute_tab1_aggregates instead, so each result has one cache layer.
+@st.cache_data(max_entries=64)
+def sum_incidents(path, keys, filters):
+    return aggregate_incidents(path, keys, filters)
+
+
+def sum_by_label_pair(path, filters):
+    """Neighborhood totals and category totals from one read of `path`.
+
+    Each (neighborhood, category) code pair is flattened to one index, so a single
+    bincount yields the 2-D grid; its row and column sums are the two rankings.
+    """
+    table = read_parquet_table(path, [*LABEL_COLUMNS, "incidents"], filters or None).unify_dictionaries()
+    nbhd, cat = (table.column(col).combine_chunks() for col in LABEL_COLUMNS)
+    shape = (len(nbhd.dictionary), len(cat.dictionary))
+
+    pair = nbhd.indices.to_numpy().astype(np.int64) * shape[1] + cat.indices.to_numpy()
+    totals = np.bincount(pair, weights=table.column("incidents").to_numpy(), minlength=shape[0] * shape[1]).reshape(shape)
+    counts = np.bincount(pair, minlength=shape[0] * shape[1]).reshape(shape)
+    return (
+        totals_frame("neighborhood", nbhd.dictionary, totals.sum(axis=1), counts.sum(axis=1)),
+        totals_frame("incident_category", cat.dictionary, totals.sum(axis=0), counts.sum(axis=0)),
+    )
+
+
+# The startup frames are loaded once per process and shared by every session without
+# the per-hit copy st.cache_data would make; they are treated as read-only from here on.
+# Per-selection results below stay in st.cache_data.
+@st.cache_resource(show_spinner="Loading dashboard artifacts...")
 def load_artifacts():
     required_files = [
         MONTHLY_NBH_CAT_FILE,
+        YEARLY_NBH_CAT_FILE,
+        TOP_NBH_BY_YEAR_FILE,
+        TOP_CAT_BY_YEAR_FILE,
+        MONTHLY_CAT_FILE,
+        CATEGORY_ORDER_FILE,
         HOURLY_WEEKDAY_FILE,
         MONTHLY_CITYWIDE_FILE,
         FORECAST_FILE,
@@ -50,88 +246,192 @@ def load_artifacts():
     if missing:
         raise FileNotFoundError("Missing required artifact(s):\n" + "\n".join(missing))
 
-    mnc = pd.read_parquet(MONTHLY_NBH_CAT_FILE)
-    hw = pd.read_parquet(HOURLY_WEEKDAY_FILE)
-    mc = pd.read_parquet(MONTHLY_CITYWIDE_FILE)
-    fc = pd.read_parquet(FORECAST_FILE)
+    # Column projection is pushed into the parquet reader, so unused columns are
+    # never materialized. The four startup reads are independent and run on a
+    # thread pool, overlapping their IO and decode. The yearly and hourly artifacts
+    # are only queried per selection (see aggregate_incidents), so meanwhile their
+    # schemas are checked without reading them; the small hourly artifact also has
+    # its values checked, since nothing else validates it.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        mnc_read = pool.submit(load_artifact, MONTHLY_NBH_CAT_FILE, MNC_COLUMNS)
+        mc_read = pool.submit(load_artifact, MONTHLY_CITYWIDE_FILE, MC_COLUMNS)
+        fc_read = pool.submit(load_artifact, FORECAST_FILE, FC_COLUMNS)
+        order_read = pool.submit(load_parquet, CATEGORY_ORDER_FILE, CATEGORY_ORDER_COLUMNS)
+
+        require_columns(YEARLY_NBH_CAT_FILE, YNC_COLUMNS)
+        require_columns(TOP_NBH_BY_YEAR_FILE, TOP_NBH_COLUMNS)
+        require_columns(TOP_CAT_BY_YEAR_FILE, TOP_CAT_COLUMNS)
+        require_columns(MONTHLY_CAT_FILE, MCAT_COLUMNS)
+        require_clean_hourly(HOURLY_WEEKDAY_FILE)
+
+        mnc, mc, fc = mnc_read.result(), mc_read.result(), fc_read.result()
+        # Sidebar category options, already sorted by all-time incidents in the builder
+        categories = order_read.result()["incident_category"].tolist()
 
     # ----------------------------
     # Validate monthly_neighborhood_category
     # ----------------------------
-    need_mnc = {"year_month", "year", "neighborhood", "incident_category", "incidents"}
-    miss_mnc = sorted(list(need_mnc - set(mnc.columns)))
-    if miss_mnc:
-        raise ValueError(f"monthly_neighborhood_category missing columns: {miss_mnc}")
+    if not is_validated(mnc, MNC_DTYPES):
+        mnc = validate_monthly_nbh_cat(mnc)
 
-    mnc = mnc.copy()
-    mnc["year_month"] = pd.to_datetime(mnc["year_month"], errors="coerce")
-    mnc["year"] = pd.to_numeric(mnc["year"], errors="coerce").astype("Int64")
-    mnc["incidents"] = pd.to_numeric(mnc["incidents"], errors="coerce").fillna(0)
-
-    mnc = mnc.dropna(subset=["year_month", "year", "neighborhood", "incident_category"])
-    mnc["year"] = mnc["year"].astype(int)
-
-    # ----------------------------
-    # Validate hourly_weekday_counts
-    # ----------------------------
-    need_hw = {"weekday_label", "hour", "incident_category", "incidents"}
-    miss_hw = sorted(list(need_hw - set(hw.columns)))
-    if miss_hw:
-        raise ValueError(f"hourly_weekday_counts missing columns: {miss_hw}")
-
-    hw = hw.copy()
-    hw["hour"] = pd.to_numeric(hw["hour"], errors="coerce").fillna(0).astype(int)
-    hw = hw[(hw["hour"] >= 0) & (hw["hour"] <= 23)].copy()
-    hw["weekday_label"] = hw["weekday_label"].astype(str)
-    hw["incident_category"] = hw["incident_category"].astype(str)
-    hw["incidents"] = pd.to_numeric(hw["incidents"], errors="coerce").fillna(0)
+    # filter_monthly slices year ranges by binary search; the builder writes the
+    # cube in time order, so this is normally just the monotonicity check
+    if not mnc["year"].is_monotonic_increasing:
+        mnc = mnc.sort_values("year", kind="stable")
 
     # ----------------------------
     # Validate monthly_citywide
     # ----------------------------
-    need_mc = {"month", "incidents"}
-    miss_mc = sorted(list(need_mc - set(mc.columns)))
-    if miss_mc:
-        raise ValueError(f"monthly_citywide missing columns: {miss_mc}")
-
-    mc = mc.copy()
-    mc["month"] = pd.to_datetime(mc["month"], errors="coerce")
-    mc["incidents"] = pd.to_numeric(mc["incidents"], errors="coerce").fillna(0)
-    mc = mc.dropna(subset=["month"]).sort_values("month")
+    if not is_validated(mc, MC_DTYPES):
+        mc = validate_monthly_citywide(mc)
+    mc = mc.sort_values("month")
 
     # ----------------------------
     # Validate forecast_citywide_monthly_2026
     # ----------------------------
-    need_fc = {"month", "forecast", "lower", "upper"}
-    miss_fc = sorted(list(need_fc - set(fc.columns)))
-    if miss_fc:
-        raise ValueError(f"forecast_citywide_monthly_2026 missing columns: {miss_fc}")
+    if not is_validated(fc, FC_DTYPES):
+        fc = validate_forecast(fc)
+    fc = fc.sort_values("month")
 
-    fc = fc.copy()
-    fc["month"] = pd.to_datetime(fc["month"], errors="coerce")
-    fc["forecast"] = pd.to_numeric(fc["forecast"], errors="coerce")
-    fc["lower"] = pd.to_numeric(fc["lower"], errors="coerce")
-    fc["upper"] = pd.to_numeric(fc["upper"], errors="coerce")
-    fc = fc.dropna(subset=["month", "forecast", "lower", "upper"]).sort_values("month")
+    # The cube is sorted by year, so its bounds are the first and last rows
+    year_bounds = (int(mnc["year"].iat[0]), int(mnc["year"].iat[-1]))
 
-    return mnc, hw, mc, fc
+    return mnc, mc, fc, categories, year_bounds
 
 
 try:
-    mnc, hw, mc, fc = load_artifacts()
+    mnc, mc, fc, categories, (year_min, year_max) = load_artifacts()
 except Exception as e:
     st.error(f"Failed to load dashboard artifacts. Details: {e}")
     st.stop()
 
 
+# ============================================================
+# Cached filters and aggregations (keyed on widget values)
+# ============================================================
+def year_slice(mnc, year_range):
+    """Rows of `mnc` within `year_range`: a contiguous slice, since the cube is sorted by year."""
+    year_arr = mnc["year"].to_numpy()
+    lo = np.searchsorted(year_arr, year_range[0], side="left")
+    hi = np.searchsorted(year_arr, year_range[1], side="right")
+    return mnc.iloc[lo:hi]
+
+
+# Leading-underscore frames are not hashed by Streamlit; the cache key is the
+# widget selection, so reruns with unchanged filters skip the mask. Only the row
+# positions are cached: a cached frame would be unpickled as a fresh copy on every hit.
+@st.cache_data(max_entries=32)
+def label_positions(_mnc, year_range, nbhds, cats):
+    rows = _mnc if year_range is None else year_slice(_mnc, year_range)
+
+    # One mask buffer over the year slice, narrowed in place by each label filter:
+    # a gather from a per-category boolean lookup table indexed by the row codes.
+    mask = np.ones(len(rows), dtype=bool)
+    for col, selected in [("neighborhood", nbhds), ("incident_category", cats)]:
+        if selected is not None:
+            labels = rows[col].cat
+            lookup = labels.categories.isin(list(selected))
+            mask &= lookup[labels.codes.to_numpy()]
+
+    return np.flatnonzero(mask).astype(np.int32)
+
+
+def filter_monthly(mnc, year_range, nbhds, cats):
+    # A None argument means "everything selected": that filter is skipped instead of
+    # scanning a full column to produce an all-True mask. Without label filters the
+    # result is the shared frame itself, or a slice of it, with no copy.
+    rows = mnc if year_range is None else year_slice(mnc, year_range)
+    if nbhds is None and cats is None:
+        return rows
+    return rows.iloc[label_positions(mnc, year_range, nbhds, cats)]
+
+
+@st.cache_data(max_entries=64, ttl=3600)
+def compute_tab1_aggregates(trend_source, top_n_source, top_c_source):
+    """Tab 1 views for one filter combination, each source an (artifact, filters) pair.
+
+    Cached as a whole across sessions, so revisiting a combination (including the
+    defaults) is a single lookup; the queries inside are not cached separately.
+    """
+    if top_n_source == top_c_source:
+        # Both rankings filter the same cube: aggregate it once for both
+        by_nbhd, by_cat = sum_by_label_pair(*top_n_source)
+    else:
+        by_nbhd = aggregate_incidents(top_n_source[0], ("neighborhood",), top_n_source[1])
+        by_cat = aggregate_incidents(top_c_source[0], ("incident_category",), top_c_source[1])
+
+    return {
+        "monthly": (
+            aggregate_incidents(trend_source[0], ("year_month",), trend_source[1])
+                .sort_values("year_month")
+        ),
+        "top_n": by_nbhd.nlargest(10, "incidents"),
+        "top_c": by_cat.nlargest(10, "incidents"),
+    }
+
+
+# The forecast chart does not depend on any filter, so the figure is built once
+# per process and shared by every session instead of being rebuilt on each rerun.
+@st.cache_resource
+def forecast_figure(_mc, _fc):
+    # The artifact stores float32; widen and round for display, so hover labels
+    # read 5462.1 rather than 5462.10009765625
+    bands = _fc[["forecast", "lower", "upper"]].astype("float64").round(2)
+
+    fig_fc = go.Figure()
+
+    fig_fc.add_trace(go.Scatter(
+        x=_mc["month"], y=_mc["incidents"],
+        mode="lines+markers", name="Historical"
+    ))
+
+    fig_fc.add_trace(go.Scatter(
+        x=_fc["month"], y=bands["forecast"],
+        mode="lines+markers", name="Forecast"
+    ))
+
+    fig_fc.add_trace(go.Scatter(
+        x=_fc["month"], y=bands["lower"],
+        mode="lines", line=dict(width=0), showlegend=False
+    ))
+
+    fig_fc.add_trace(go.Scatter(
+        x=_fc["month"], y=bands["upper"],
+        mode="lines", line=dict(width=0),
+        fill="tonexty", name="Confidence Interval"
+    ))
+
+    fig_fc.update_layout(height=520, hovermode="x unified")
+    return fig_fc
+
+
+# Download payloads are built only when a button is clicked (Streamlit calls the
+# callable), with Arrow's writers, and cached on filter_key rather than the frame:
+# repeat clicks on the same selection skip both hashing and re-encoding.
+@st.cache_data(max_entries=8)
+def monthly_csv_bytes(_df, filter_key):
+    table = pa.Table.from_pandas(_df, preserve_index=False)
+    # Month-start timestamps are written as plain dates
+    i = table.schema.get_field_index("year_month")
+    table = table.set_column(i, "year_month", table["year_month"].cast(pa.date32()))
+
+    buf = io.BytesIO()
+    pacsv.write_csv(table, buf)
+    return buf.getvalue()
+
+
+@st.cache_data(max_entries=8)
+def parquet_bytes(_df, filter_key):
+    buf = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(_df, preserve_index=False), buf)
+    return buf.getvalue()
+
+
 # ============================================================
 # Sidebar filters (based on mnc)
 # ============================================================
 st.sidebar.header("Filters")
 
-years = sorted(mnc["year"].unique())
-year_min, year_max = int(min(years)), int(max(years))
-
 year_range = st.sidebar.slider(
     "Year range",
     min_value=year_min,
@@ -140,20 +440,14 @@ year_range = st.sidebar.slider(
     step=1,
 )
 
-neighborhoods = sorted(mnc["neighborhood"].unique())
+# Categorical categories are the distinct labels, already sorted
+neighborhoods = mnc["neighborhood"].cat.categories.tolist()
 selected_nbhds = st.sidebar.multiselect(
     "Neighborhoods",
     options=neighborhoods,
     default=neighborhoods,   # portfolio-friendly: show full city by default
 )
 
-categories = (
-    mnc.groupby("incident_category", observed=True)["incidents"]
-       .sum()
-       .sort_values(ascending=False)
-       .index
-       .tolist()
-)
 default_categories = categories[:10] if len(categories) > 10 else categories
 
 selected_categories = st.sidebar.multiselect(
@@ -166,29 +460,97 @@ if len(selected_nbhds) == 0 or len(selected_categories) == 0:
     st.warning("Please select at least one neighborhood and one category in the sidebar.")
     st.stop()
 
-mask_mnc = (
-    (mnc["year"] >= year_range[0]) &
-    (mnc["year"] <= year_range[1]) &
-    (mnc["neighborhood"].isin(selected_nbhds)) &
-    (mnc["incident_category"].isin(selected_categories))
-)
-mnc_filt = mnc.loc[mask_mnc].copy()
+# Selections as frozensets for the order-independent session-state comparison,
+# and as sorted tuples for every cache argument: st.cache_data hashes a frozenset
+# in its iteration order, so two equal sets could still miss the cache.
+selected_nbhds_s = frozenset(selected_nbhds)
+selected_categories_s = frozenset(selected_categories)
+selected_nbhds_t = tuple(sorted(selected_nbhds_s))
+selected_categories_t = tuple(sorted(selected_categories_s))
+
+# A filter left at "everything selected" (the default for years and neighborhoods)
+# removes nothing, so it contributes no mask and no parquet predicate at all.
+all_years_selected = tuple(year_range) == (year_min, year_max)
+all_nbhds_selected = len(selected_nbhds_s) == len(neighborhoods)
+all_categories_selected = len(selected_categories_s) == len(categories)
+
+# The trend and rankings query the monthly / yearly cubes; the hour × weekday views
+# query the hourly artifact. All push the sidebar selection down as parquet predicates.
+year_filters = [] if all_years_selected else [("year", ">=", year_range[0]), ("year", "<=", year_range[1])]
+nbhd_filters = [] if all_nbhds_selected else [("neighborhood", "in", list(selected_nbhds_t))]
+category_filters = [] if all_categories_selected else [("incident_category", "in", list(selected_categories_t))]
+cube_filters = [*year_filters, *nbhd_filters, *category_filters]
+
+# Without a neighborhood filter the trend is read from the monthly-by-category cube,
+# which is ~20x smaller than the full monthly cube.
+if all_nbhds_selected:
+    trend_source = (MONTHLY_CAT_FILE, [*year_filters, *category_filters])
+else:
+    trend_source = (MONTHLY_NBH_CAT_FILE, cube_filters)
+
+# When every category (or neighborhood) is selected, the neighborhood (or category)
+# ranking only depends on the years and can be read from the precomputed totals.
+if all_categories_selected:
+    top_n_source = (TOP_NBH_BY_YEAR_FILE, [*year_filters, *nbhd_filters])
+else:
+    top_n_source = (YEARLY_NBH_CAT_FILE, cube_filters)
+
+if all_nbhds_selected:
+    top_c_source = (TOP_CAT_BY_YEAR_FILE, [*year_filters, *category_filters])
+else:
+    top_c_source = (YEARLY_NBH_CAT_FILE, cube_filters)
+
+# Hours are already checked to lie in 0-23 at startup (require_clean_hourly)
+hw_filters = category_filters
+
+# Every tab view is materialized once per filter combination and kept in the
+# session, so reruns that leave the filters alone (e.g. download clicks) reuse
+# the same frames without going back through the caches.
+selection = (tuple(year_range), selected_nbhds_s, selected_categories_s)
+filter_key = (tuple(year_range), selected_nbhds_t, selected_categories_t)
+if st.session_state.get("selection") != selection:
+    st.session_state["selection"] = selection
+    st.session_state["views"] = {
+        "mnc_filt": filter_monthly(
+            mnc,
+            None if all_years_selected else year_range,
+            None if all_nbhds_selected else selected_nbhds_t,
+            None if all_categories_selected else selected_categories_t,
+        ),
+        **compute_tab1_aggregates(trend_source, top_n_source, top_c_source),
+        "hw_agg": sum_incidents(HOURLY_WEEKDAY_FILE, ("weekday_label", "hour"), hw_filters),
+        "hourly": sum_incidents(HOURLY_WEEKDAY_FILE, ("hour",), hw_filters).sort_values("hour"),
+        "wk": sum_incidents(HOURLY_WEEKDAY_FILE, ("weekday_label",), hw_filters),
+    }
+
+views = st.session_state["views"]
+mnc_filt = views["mnc_filt"]
 
 st.sidebar.markdown("---")
 st.sidebar.download_button(
     "Download filtered monthly table (CSV)",
-    data=mnc_filt.to_csv(index=False).encode("utf-8"),
+    data=partial(monthly_csv_bytes, mnc_filt, filter_key),
     file_name="sf_crime_monthly_filtered.csv",
     mime="text/csv",
 )
+st.sidebar.download_button(
+    "Download filtered monthly table (Parquet)",
+    data=partial(parquet_bytes, mnc_filt, filter_key),
+    file_name="sf_crime_monthly_filtered.parquet",
+    mime="application/vnd.apache.parquet",
+)
 
 
 # ============================================================
 # Summary metrics
 # ============================================================
-total_incidents = int(mnc_filt["incidents"].sum()) if len(mnc_filt) else 0
-months_in_view = int(mnc_filt["year_month"].dt.to_period("M").nunique()) if len(mnc_filt) else 0
-nbhds_in_view = int(mnc_filt["neighborhood"].nunique()) if len(mnc_filt) else 0
+# Computed on the underlying NumPy arrays; all three are 0 for an empty selection.
+total_incidents = int(mnc_filt["incidents"].to_numpy().sum())
+# Distinct months as a unique over the int64 view of month-truncated datetimes
+months_in_view = int(np.unique(mnc_filt["year_month"].to_numpy().astype("datetime64[M]").view("i8")).size)
+# Distinct neighborhoods = categories whose code occurs at least once
+nbhd_labels = mnc_filt["neighborhood"].cat
+nbhds_in_view = int(np.count_nonzero(np.bincount(nbhd_labels.codes.to_numpy(), minlength=len(nbhd_labels.categories))))
 
 st.write(f"Filtered incidents (from monthly aggregates): **{total_incidents:,}**")
 
@@ -215,41 +577,23 @@ with tab1:
     if len(mnc_filt) == 0:
         st.info("No data under current filters.")
     else:
-        monthly = (
-            mnc_filt.groupby("year_month", observed=True)["incidents"]
-                    .sum()
-                    .reset_index()
-                    .sort_values("year_month")
-        )
-
-        fig_ts = px.line(monthly, x="year_month", y="incidents", markers=True)
+        # One point per month (<= 96 for 2018–2025) regardless of how many rows the filters match
+        fig_ts = px.line(views["monthly"], x="year_month", y="incidents", markers=True)
+        fig_ts.update_traces(marker={"size": 4})
+        fig_ts.update_layout(hovermode="x unified")
         st.plotly_chart(fig_ts, use_container_width=True)
 
         c1, c2 = st.columns(2)
 
         with c1:
             st.subheader("Top Neighborhoods")
-            top_n = (
-                mnc_filt.groupby("neighborhood", observed=True)["incidents"]
-                        .sum()
-                        .sort_values(ascending=False)
-                        .head(10)
-                        .reset_index()
-            )
-            fig_n = px.bar(top_n, x="incidents", y="neighborhood", orientation="h")
+            fig_n = px.bar(views["top_n"], x="incidents", y="neighborhood", orientation="h")
             fig_n.update_layout(yaxis={"categoryorder": "total ascending"})
             st.plotly_chart(fig_n, use_container_width=True)
 
         with c2:
             st.subheader("Top Categories")
-            top_c = (
-                mnc_filt.groupby("incident_category", observed=True)["incidents"]
-                        .sum()
-                        .sort_values(ascending=False)
-                        .head(10)
-                        .reset_index()
-            )
-            fig_c = px.bar(top_c, x="incident_category", y="incidents")
+            fig_c = px.bar(views["top_c"], x="incident_category", y="incidents")
             st.plotly_chart(fig_c, use_container_width=True)
 
 
@@ -259,45 +603,47 @@ with tab1:
 with tab2:
     st.subheader("Hour × Weekday Heatmap (category-filtered)")
 
-    hw_filt = hw[hw["incident_category"].isin(selected_categories)].copy()
+    hw_agg = views["hw_agg"]
 
-    if len(hw_filt) == 0:
+    if len(hw_agg) == 0:
         st.info("No hourly-weekday data for the selected categories.")
     else:
         weekday_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        weekday_values = sorted(hw_filt["weekday_label"].unique())
+        weekday_values = sorted(hw_agg["weekday_label"].unique())
         weekday_options = [d for d in weekday_order if d in weekday_values] + [
             d for d in weekday_values if d not in weekday_order
         ]
 
-        hw_filt["weekday_label"] = pd.Categorical(
-            hw_filt["weekday_label"], categories=weekday_options, ordered=True
-        )
-        hw_filt = hw_filt.sort_values(["weekday_label", "hour"])
-
-        fig_h = px.density_heatmap(
-            hw_filt,
-            x="hour",
-            y="weekday_label",
-            z="incidents",
-            nbinsx=24,
-            labels={"weekday_label": "Weekday", "hour": "Hour", "incidents": "Incidents"},
-        )
+        # Scatter-add the (weekday, hour) totals into the 7 × 24 grid, so Plotly
+        # receives 168 prebinned cells instead of re-binning rows
+        wd_idx = pd.Categorical(hw_agg["weekday_label"], categories=weekday_options).codes
+        heat = np.zeros((len(weekday_options), 24), dtype=np.int64)
+        np.add.at(heat, (wd_idx, hw_agg["hour"].to_numpy()), hw_agg["incidents"].to_numpy())
+
+        fig_h = go.Figure(go.Heatmap(
+            z=heat,
+            x=np.arange(24),
+            y=weekday_options,
+            colorbar={"title": "Incidents"},
+            hovertemplate="Hour: %{x}<br>Weekday: %{y}<br>Incidents: %{z}<extra></extra>",
+        ))
+        # Monday on the top row, Sunday at the bottom
+        fig_h.update_layout(xaxis_title="Hour", yaxis_title="Weekday", yaxis_autorange="reversed")
         st.plotly_chart(fig_h, use_container_width=True)
 
         c1, c2 = st.columns(2)
 
         with c1:
             st.subheader("Hourly pattern")
-            hourly = hw_filt.groupby("hour", observed=True)["incidents"].sum().reset_index()
-            fig_hour = px.line(hourly, x="hour", y="incidents", markers=True)
+            fig_hour = px.line(views["hourly"], x="hour", y="incidents", markers=True)
             st.plotly_chart(fig_hour, use_container_width=True)
 
         with c2:
             st.subheader("Weekday pattern")
-            wk = hw_filt.groupby("weekday_label", observed=True)["incidents"].sum().reset_index()
-            wk["weekday_label"] = pd.Categorical(wk["weekday_label"], categories=weekday_options, ordered=True)
-            wk = wk.sort_values("weekday_label")
+            wk = views["wk"]
+            wk = wk.assign(
+                weekday_label=pd.Categorical(wk["weekday_label"], categories=weekday_options, ordered=True)
+            ).sort_values("weekday_label")
             fig_wk = px.bar(wk, x="weekday_label", y="incidents")
             st.plotly_chart(fig_wk, use_container_width=True)
 
@@ -308,31 +654,7 @@ with tab2:
 with tab3:
     st.subheader("Citywide Monthly Forecast (precomputed)")
 
-    fig_fc = go.Figure()
-
-    fig_fc.add_trace(go.Scatter(
-        x=mc["month"], y=mc["incidents"],
-        mode="lines+markers", name="Historical"
-    ))
-
-    fig_fc.add_trace(go.Scatter(
-        x=fc["month"], y=fc["forecast"],
-        mode="lines+markers", name="Forecast"
-    ))
-
-    fig_fc.add_trace(go.Scatter(
-        x=fc["month"], y=fc["lower"],
-        mode="lines", line=dict(width=0), showlegend=False
-    ))
-
-    fig_fc.add_trace(go.Scatter(
-        x=fc["month"], y=fc["upper"],
-        mode="lines", line=dict(width=0),
-        fill="tonexty", name="Confidence Interval"
-    ))
-
-    fig_fc.update_layout(height=520)
-    st.plotly_chart(fig_fc, use_container_width=True)
+    st.plotly_chart(forecast_figure(mc, fc), use_container_width=True)
 
     st.caption(
         "Baseline forecast using a seasonal time-series model on monthly citywide totals. "
@@ -0,0 +1,87 @@
+# dashboard/validation.py
+# Cleaning and dtype rules for the artifacts the dashboard loads at startup.
+# Shared by the app (parquet fallback) and the artifact builder (Arrow IPC copies),
+# so both produce identical frames.
+
+import numpy as np
+import pandas as pd
+
+
+# Dtypes each startup frame is validated into. Frames that already arrive in
+# these types (the builder's Arrow IPC copies) skip the coercion pass.
+MNC_DTYPES = {
+    "year_month": "datetime64[ns]",
+    "year": "int16",
+    "neighborhood": "category",
+    "incident_category": "category",
+    "incidents": "uint32",
+}
+MC_DTYPES = {"month": "datetime64[ns]", "incidents": "uint32"}
+FC_DTYPES = {"month": "datetime64[ns]", "forecast": "float32", "lower": "float32", "upper": "float32"}
+
+
+def downcast(series, dtype):
+    """Cast to a narrower integer dtype, refusing values that would not fit."""
+    info = np.iinfo(dtype)
+    if len(series) and (series.min() < info.min or series.max() > info.max):
+        raise ValueError(f"{series.name} values exceed the {dtype} range")
+    return series.astype(dtype)
+
+
+def is_validated(df, dtypes):
+    """True when `df` is already in the validated dtypes and has no missing values.
+
+    The dtype check is schema-only; the null scan is one vectorized pass, far
+    cheaper than re-running the coercions.
+    """
+    return all(str(df[col].dtype) == dtype for col, dtype in dtypes.items()) and not df.isna().any().any()
+
+
+def validate_monthly_nbh_cat(mnc):
+    """Drop rows without a month, year or label; missing incidents count as 0."""
+    mnc = mnc.assign(
+        year_month=pd.to_datetime(mnc["year_month"], errors="coerce"),
+        year=pd.to_numeric(mnc["year"], errors="coerce").astype("Int64"),
+        incidents=pd.to_numeric(mnc["incidents"], errors="coerce").fillna(0),
+    )
+    mnc = mnc.dropna(subset=["year_month", "year", "neighborhood", "incident_category"])
+
+    # Narrow integer columns (filter/sum passes move half the bytes) and
+    # low-cardinality labels as categoricals (isin/groupby work on integer codes)
+    return mnc.assign(
+        year=downcast(mnc["year"], "int16"),
+        incidents=downcast(mnc["incidents"], "uint32"),
+        neighborhood=mnc["neighborhood"].astype("category"),
+        incident_category=mnc["incident_category"].astype("category"),
+    )
+
+
+def validate_monthly_citywide(mc):
+    """Drop rows without a month; missing incidents count as 0."""
+    return mc.assign(
+        month=pd.to_datetime(mc["month"], errors="coerce"),
+        incidents=downcast(pd.to_numeric(mc["incidents"], errors="coerce").fillna(0), "uint32"),
+    ).dropna(subset=["month"])
+
+
+def validate_forecast(fc):
+    """Drop rows without a month or any of the forecast values."""
+    return (
+        fc.assign(month=pd.to_datetime(fc["month"], errors="coerce"))
+          .astype({"forecast": "float32", "lower": "float32", "upper": "float32"})
+          .dropna(subset=["month", "forecast", "lower", "upper"])
+    )
+
+
+def validate_hourly_weekday(hw):
+    """Missing hours and incidents count as 0; rows without a label or outside hours 0-23 are dropped."""
+    hw = hw.assign(
+        hour=pd.to_numeric(hw["hour"], errors="coerce").fillna(0),
+        incidents=pd.to_numeric(hw["incidents"], errors="coerce").fillna(0),
+    )
+    hw = hw[hw["hour"].between(0, 23)].dropna(subset=["weekday_label", "incident_category"])
+
+    return hw.assign(
+        hour=downcast(hw["hour"], "int8"),
+        incidents=downcast(hw["incidents"], "uint32"),
+    )
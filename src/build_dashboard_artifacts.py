@@ -1,12 +1,129 @@
 # src/build_dashboard_artifacts.py
+# Run from the repository root: python -m src.build_dashboard_artifacts
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+# The dashboard's startup validation rules, so the Arrow copies match its parquet fallback
+from dashboard.validation import (
+    validate_forecast,
+    validate_hourly_weekday,
+    validate_monthly_citywide,
+    validate_monthly_nbh_cat,
+)
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT_DIR / "data" / "processed"
 
 INCIDENTS_FILE = DATA_DIR / "incidents_clean_2018_2025.parquet"
 OUT_MONTHLY_NBH_CAT = DATA_DIR / "monthly_neighborhood_category.parquet"
+OUT_YEARLY_NBH_CAT = DATA_DIR / "yearly_neighborhood_category.parquet"
+OUT_TOP_NBH_BY_YEAR = DATA_DIR / "top_neighborhoods_by_year.parquet"
+OUT_TOP_CAT_BY_YEAR = DATA_DIR / "top_categories_by_year.parquet"
+OUT_MONTHLY_CAT = DATA_DIR / "monthly_category.parquet"
+OUT_CATEGORY_ORDER = DATA_DIR / "category_order.parquet"
+
+# Produced by the forecasting notebook; mirrored to Arrow IPC below when present
+MONTHLY_CITYWIDE_FILE = DATA_DIR / "monthly_citywide.parquet"
+FORECAST_FILE = DATA_DIR / "forecast_citywide_monthly_2026.parquet"
+# Also from the notebook; rewritten in place below with validated, narrowed columns
+HOURLY_WEEKDAY_FILE = DATA_DIR / "hourly_weekday_counts.parquet"
+
+LABEL_COLUMNS = ["neighborhood", "incident_category"]
+# Narrowest integer types that hold each column; write_artifact casts to them
+INT_DTYPES = {"year": "int16", "hour": "int8", "incidents": "uint32"}
+
+# The Arrow IPC copies go through the dashboard's own validation, so they hold
+# exactly the rows and dtypes its parquet fallback would produce
+ARROW_COPY_VALIDATORS = {
+    OUT_MONTHLY_NBH_CAT: validate_monthly_nbh_cat,
+    MONTHLY_CITYWIDE_FILE: validate_monthly_citywide,
+    FORECAST_FILE: validate_forecast,
+}
+
+def count_rows(df, keys):
+    # Row counts per distinct key combination. Each key's categorical codes are packed
+    # into one mixed-radix int64 code per row, so a single value_counts replaces a
+    # multi-column hash groupby; the codes are unpacked back into columns afterwards.
+    cats = [pd.Categorical(df[key]) for key in keys]
+    code = np.zeros(len(df), dtype=np.int64)
+    for cat in cats:
+        code = code * len(cat.categories) + cat.codes
+
+    counts = pd.Series(code).value_counts(sort=False)
+    rest = counts.index.to_numpy()
+    columns = {}
+    for key, cat in reversed(list(zip(keys, cats))):
+        rest, key_code = np.divmod(rest, len(cat.categories))
+        columns[key] = cat.categories[key_code]
+    return pd.DataFrame({key: columns[key] for key in keys}).assign(incidents=counts.to_numpy())
+
+def sum_incidents(df, keys):
+    # Incidents summed per key combination by Arrow's vectorized, multithreaded
+    # hash aggregation rather than a pandas groupby
+    table = pa.Table.from_pandas(df[[*keys, "incidents"]], preserve_index=False)
+    out = table.group_by(keys).aggregate([("incidents", "sum")]).to_pandas()
+    return out.rename(columns={"incidents_sum": "incidents"})[[*keys, "incidents"]]
+
+def build_yearly_nbh_cat(monthly_nbh_cat):
+    # Year-level cube for the ranking charts: ~12x fewer rows than the monthly cube
+    return (
+        sum_incidents(monthly_nbh_cat, ["year", "neighborhood", "incident_category"])
+          .sort_values(["year", "neighborhood", "incident_category"])
+          .reset_index(drop=True)
+    )
+
+def build_monthly_cat(monthly_nbh_cat):
+    # Monthly trend per category over all neighborhoods: serves the trend chart
+    # whenever no neighborhood filter is active
+    return (
+        sum_incidents(monthly_nbh_cat, ["year_month", "year", "incident_category"])
+          .sort_values(["year_month", "incident_category"])
+          .reset_index(drop=True)
+    )
+
+def build_totals_by_year(monthly_nbh_cat, key):
+    # Per-year totals of one dimension over all values of the other, largest first,
+    # so unfiltered rankings are a read of a few hundred rows
+    return (
+        sum_incidents(monthly_nbh_cat, ["year", key])
+          .sort_values(["year", "incidents", key], ascending=[True, False, True])
+          .reset_index(drop=True)
+    )
+
+def build_category_order(monthly_nbh_cat):
+    # All-time category totals, largest first: the dashboard's sidebar option order
+    return (
+        sum_incidents(monthly_nbh_cat, ["incident_category"])
+          .sort_values(["incidents", "incident_category"], ascending=[False, True])
+          .reset_index(drop=True)
+    )
+
+def write_artifact(df, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Low-cardinality labels are written dictionary-encoded so readers get codes, not strings
+    df = df.astype({col: "category" for col in LABEL_COLUMNS if col in df.columns})
+    df = df.astype({col: dtype for col, dtype in INT_DTYPES.items() if col in df.columns})
+    # Small aggregate tables: one row group (one set of column chunks to decode on
+    # read) and zstd, ~25% smaller than the snappy default
+    df.to_parquet(path, index=False, compression="zstd", compression_level=3, row_group_size=max(len(df), 1))
+
+    print("Wrote:", path)
+    print("Shape:", df.shape)
+    print("Columns:", list(df.columns))
+
+def write_arrow_copy(path):
+    # Uncompressed Arrow IPC (Feather v2) next to a parquet artifact the dashboard
+    # loads at startup: it is memory-mapped there, with no decompression or decode.
+    # Rows are cleaned and cast to the dashboard dtypes here, once, instead of on
+    # every cold start of the app.
+    df = ARROW_COPY_VALIDATORS[path](pd.read_parquet(path))
+    out = path.with_suffix(".arrow")
+    feather.write_feather(df, out, compression="uncompressed")
+    print("Wrote:", out)
 
 def main():
     if not INCIDENTS_FILE.exists():
@@ -29,26 +146,33 @@ def main():
     else:
         raise ValueError("Need one of: year_month, month, or incident_datetime to build monthly axis")
 
-    df = df.copy()
-    df["year_month"] = ym
-    df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
+    df = df.assign(
+        year_month=ym,
+        year=pd.to_numeric(df["year"], errors="coerce").astype("Int64"),
+    )
     df = df.dropna(subset=["year_month", "year", "neighborhood", "incident_category"])
-    df["year"] = df["year"].astype(int)
+    df = df.assign(year=df["year"].astype(int))
 
     monthly_nbh_cat = (
-        df.groupby(["year_month", "year", "neighborhood", "incident_category"], observed=True)
-          .size()
-          .reset_index(name="incidents")
+        count_rows(df, ["year_month", "year", "neighborhood", "incident_category"])
           .sort_values(["year_month", "neighborhood", "incident_category"])
           .reset_index(drop=True)
     )
 
-    OUT_MONTHLY_NBH_CAT.parent.mkdir(parents=True, exist_ok=True)
-    monthly_nbh_cat.to_parquet(OUT_MONTHLY_NBH_CAT, index=False)
+    write_artifact(monthly_nbh_cat, OUT_MONTHLY_NBH_CAT)
+    write_artifact(build_yearly_nbh_cat(monthly_nbh_cat), OUT_YEARLY_NBH_CAT)
+    write_artifact(build_totals_by_year(monthly_nbh_cat, "neighborhood"), OUT_TOP_NBH_BY_YEAR)
+    write_artifact(build_totals_by_year(monthly_nbh_cat, "incident_category"), OUT_TOP_CAT_BY_YEAR)
+    write_artifact(build_monthly_cat(monthly_nbh_cat), OUT_MONTHLY_CAT)
+    write_artifact(build_category_order(monthly_nbh_cat), OUT_CATEGORY_ORDER)
+
+    if HOURLY_WEEKDAY_FILE.exists():
+        write_artifact(validate_hourly_weekday(pd.read_parquet(HOURLY_WEEKDAY_FILE)), HOURLY_WEEKDAY_FILE)
 
-    print("Wrote:", OUT_MONTHLY_NBH_CAT)
-    print("Shape:", monthly_nbh_cat.shape)
-    print("Columns:", list(monthly_nbh_cat.columns))
+    write_arrow_copy(OUT_MONTHLY_NBH_CAT)
+    for path in [MONTHLY_CITYWIDE_FILE, FORECAST_FILE]:
+        if path.exists():
+            write_arrow_copy(path)
 
 if __name__ == "__main__":
     main()